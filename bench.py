@@ -0,0 +1,232 @@
+"""Microbenchmarks for the batched simulation paths.
+
+Run with:  python bench.py
+"""
+import functools
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import sim
+
+MATCHUPS = {
+    "Aethel vs Borog": ((8, 7, 2, 8), (4, 3, 9, 2)),
+    "Even rivals": ((5, 5, 3, 6), (5, 5, 3, 6)),
+    "Peaceful neighbours": ((6, 4, 1, 7), (5, 5, 1, 7)),
+}
+
+def best_of(func, repeats=5):
+    """Best wall-clock time of func() over several runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_precision(n_pairs=20000, num_turns=100, seed=0):
+    """Compares float32 and float64 batches: throughput and drift of the final state."""
+    print(f"--- run_batch precision ({n_pairs} pairs, {num_turns} turns) ---")
+    for label, (traits1, traits2) in MATCHUPS.items():
+        civ1, civ2 = sim.Civilization("Civ 1", *traits1), sim.Civilization("Civ 2", *traits2)
+        results, timings = {}, {}
+        for dtype in (np.float64, np.float32):
+            civs = sim.batch_civs(civ1, civ2, n_pairs, dtype)
+            timings[dtype] = best_of(lambda: sim.run_batch(civs, num_turns, seed=seed))
+            results[dtype] = sim.run_batch(civs, num_turns, seed=seed)
+
+        exact, single = results[np.float64], results[np.float32]
+        same_outcome = (exact["alive"] == single["alive"]).all(axis=0)
+        overflowed = ~np.isfinite(single["pop"]).all(axis=0) | ~np.isfinite(exact["pop"]).all(axis=0)
+        # Relative drift of every surviving, finite civ whose pair ended the same way at both precisions
+        compared = (same_outcome & ~overflowed) & exact["alive"]
+        rel_drift = np.abs(single["pop"][compared] - exact["pop"][compared]) / exact["pop"][compared]
+        drift = f"median {np.median(rel_drift):.2e}, max {rel_drift.max():.2e}" if rel_drift.size else "n/a"
+        print(f"{label}: float64 {timings[np.float64] * 1e3:.1f} ms, float32 {timings[np.float32] * 1e3:.1f} ms "
+              f"({timings[np.float64] / timings[np.float32]:.2f}x); same outcome {same_outcome.mean():.1%}, "
+              f"pop drift {drift}, overflowed {overflowed.mean():.1%}")
+
+def bench_tech_lut(n=200000):
+    """(1 + tech * 0.1) and its reciprocal: recomputed, computed once, or looked up in a table binned at 0.01 tech."""
+    print(f"--- tech factor lookup table ({n} values) ---")
+    tech_mul = np.arange(0, 1000) * 0.01 * 0.1 + 1.0
+    tech_div = 1.0 / tech_mul
+    mul_list, div_list = tech_mul.tolist(), tech_div.tolist()
+    techs = np.random.default_rng(0).uniform(1.0, 20.0, n) # Tech regularly passes 10 in long runs
+    tech_values = techs.tolist()
+
+    def scalar_recomputed():
+        for tech in tech_values:
+            bonus = 1 + tech * 0.1
+            penalty = 1 / (1 + tech * 0.1)
+
+    def scalar_once():
+        for tech in tech_values:
+            bonus = 1 + tech * 0.1
+            penalty = 1 / bonus
+
+    def scalar_lut():
+        for tech in tech_values:
+            idx = int(tech * 100)
+            if idx < 1000:
+                bonus, penalty = mul_list[idx], div_list[idx]
+            else:
+                bonus = 1 + tech * 0.1
+                penalty = 1 / bonus
+
+    def vector_once():
+        factor = 1 + techs * 0.1
+        return factor, 1 / factor
+
+    def vector_lut():
+        idx = np.minimum((techs * 100).astype(np.intp), 999)
+        return tech_mul[idx], tech_div[idx]
+
+    timings = {func.__name__: best_of(func) for func in (scalar_recomputed, scalar_once, scalar_lut, vector_once, vector_lut)}
+    for name, seconds in timings.items():
+        print(f"{name}: {seconds * 1e3:.2f} ms")
+    low = techs < 9.99
+    max_error = np.max(np.abs(tech_mul[(techs[low] * 100).astype(np.intp)] - (1 + techs[low] * 0.1)) / (1 + techs[low] * 0.1))
+    print(f"LUT relative error up to {max_error:.1e} inside its range")
+
+@dataclass(slots=True, eq=False)
+class _MemoCivilization(sim.Civilization):
+    """Civilization that reuses tech_level ** TECH_COMBAT_FACTOR while tech_level is unchanged."""
+
+    _last_tech: float = field(default=None, init=False, repr=False)
+    _last_tech_pow: float = field(default=None, init=False, repr=False)
+
+    def calculate_strength(self):
+        if not self.is_alive:
+            return 0
+        if self.tech_level != self._last_tech:
+            self._last_tech, self._last_tech_pow = self.tech_level, self.tech_level ** sim.TECH_COMBAT_FACTOR
+        return self.population * self._last_tech_pow
+
+def bench_strength_cache(num_turns=100000, queries_per_turn=(1, 2)):
+    """Civilization.calculate_strength against a per-instance tech power memo and a functools.lru_cache(maxsize=4) on (pop, tech, alive)."""
+    print(f"--- strength caching ({num_turns} turns) ---")
+    @functools.lru_cache(maxsize=4)
+    def lru_strength(pop, tech, alive):
+        return pop * tech ** sim.TECH_COMBAT_FACTOR if alive else 0
+
+    rng = np.random.default_rng(0)
+    # Research runs almost every turn; in run_simulation trajectories tech_level is unchanged on only a few % of queries
+    techs = np.cumsum(np.where(rng.random(num_turns) < 0.04, 0.0, rng.uniform(0.001, 0.05, num_turns))) + 1.0
+    pops = rng.uniform(500, 5000, num_turns)
+    states = list(zip(pops.tolist(), techs.tolist()))
+    civ = sim.Civilization("Civ", 5, 5, 3, 6)
+    memo_civ = _MemoCivilization("Civ", 5, 5, 3, 6)
+
+    for queries in queries_per_turn:
+        def recomputed():
+            for pop, tech in states:
+                civ.population, civ.tech_level = pop, tech
+                for _ in range(queries):
+                    civ.calculate_strength()
+
+        def memo():
+            for pop, tech in states:
+                memo_civ.population, memo_civ.tech_level = pop, tech
+                for _ in range(queries):
+                    memo_civ.calculate_strength()
+
+        def lru():
+            for pop, tech in states:
+                civ.population, civ.tech_level = pop, tech
+                for _ in range(queries):
+                    lru_strength(civ.population, civ.tech_level, civ.is_alive)
+
+        timings = {func.__name__: best_of(func) for func in (recomputed, memo, lru)}
+        print(f"{queries} per turn: " + ", ".join(f"{name} {seconds * 1e3:.1f} ms" for name, seconds in timings.items()))
+
+def _ratio_strength_interact(pop, res, tech, intel, agg, coop, running, u):
+    """sim.interact with the strengths computed for every pair and compared by ratio (the #chunk0-18 form)."""
+    strength = pop * (tech ** sim.TECH_COMBAT_FACTOR)
+    s1, s2 = strength
+    agg1, agg2 = agg
+    combined_agg = agg1 + agg2
+    combined_coop = coop[0] + coop[1]
+
+    # Determine relative strength (pairs that already ended have zero strength)
+    first_stronger = (s1 > s2) & (s2 > 0)
+    second_stronger = (s2 > s1) & (s1 > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength_ratio = np.where(first_stronger, s1 / s2, np.where(second_stronger, s2 / s1, 1.0))
+    stronger_agg = np.where(first_stronger, agg1, agg2)
+    weaker_agg = np.where(first_stronger, agg2, agg1)
+
+    # Decide both checks for every pair up front; cooperation only if no conflict occurred
+    opportunistic = ((first_stronger | second_stronger) & (stronger_agg > weaker_agg + 3)
+                     & (strength_ratio > sim.STRENGTH_DIFF_AGG_MOD) & (u[:, 1] < stronger_agg / 10.0))
+    will_fight = running & ((combined_agg > sim.CONFLICT_THRESHOLD_AGG * (0.8 + 0.4 * u[:, 0])) | opportunistic)
+    will_coop = running & ~will_fight & (combined_coop > sim.COOPERATION_THRESHOLD_COOP * (0.8 + 0.4 * u[:, 5]))
+    fight = np.flatnonzero(will_fight)
+    coop_idx = np.flatnonzero(will_coop)
+
+    pop, res, tech = pop.copy(), res.copy(), tech.copy()
+    killed = np.zeros(pop.shape, dtype=bool)
+
+    # 1. Conflict, for the fighting pairs only
+    if fight.size:
+        uf = u[fight]
+        fs1, fs2 = s1[fight], s2[fight]
+        # Attacker is the more aggressive civ; ties are broken by a coin flip
+        atk_is_1 = (agg1[fight] > agg2[fight]) | ((agg1[fight] == agg2[fight]) & (uf[:, 2] < 0.5))
+        s_attacker = np.where(atk_is_1, fs1, fs2)
+        s_defender = np.where(atk_is_1, fs2, fs1)
+
+        defender_effective_strength = s_defender / (1 + np.maximum(0, s_attacker / (s_defender + 1) - 1))
+        attacker_loss_mult = sim.COMBAT_LOSS_BASE * (1 + defender_effective_strength / (s_attacker + 1)) * (0.7 + 0.6 * uf[:, 3])
+        defender_loss_mult = sim.COMBAT_LOSS_BASE * (1 + s_attacker / (defender_effective_strength + 1)) * (0.7 + 0.6 * uf[:, 4])
+        is_attacker = np.stack([atk_is_1, ~atk_is_1])
+        loss_mult = np.where(is_attacker, attacker_loss_mult, defender_loss_mult)
+
+        fpop, fres = pop[:, fight], res[:, fight]
+        tech_factor = 1 + tech[:, fight] * 0.1
+        fpop = fpop - np.minimum(fpop * 0.9, fpop * loss_mult / tech_factor)
+        fres = fres - np.minimum(fres * 0.9, fres * loss_mult * tech_factor)
+        pop[:, fight], res[:, fight] = fpop, fres
+        killed[:, fight] = (fpop <= 1) | (fres < 0)
+
+    # 2. Cooperation, for the cooperating pairs only
+    if coop_idx.size:
+        res[:, coop_idx] += res[:, coop_idx] * sim.COOP_RESOURCE_BONUS * (coop[::-1, coop_idx] / 10.0)
+        tech[:, coop_idx] += sim.COOP_TECH_BONUS * (intel[::-1, coop_idx] / 5.0)
+
+    return pop, res, tech, killed
+
+def bench_log_strength(n_pairs=20000, num_turns=60, seed=0, repeats=7):
+    """run_batch with sim.interact (log-space strength comparison) against the ratio form, for every matchup at both precisions."""
+    print(f"--- log-space strength comparison ({n_pairs} pairs, {num_turns} turns) ---")
+    totals = {"interact": 0.0, "ratio": 0.0}
+    for dtype in (np.float32, np.float64):
+        for label, (traits1, traits2) in MATCHUPS.items():
+            civs = sim.batch_civs(sim.Civilization("Civ 1", *traits1), sim.Civilization("Civ 2", *traits2), n_pairs, dtype)
+            timings, results = {"interact": float("inf"), "ratio": float("inf")}, {}
+            # Alternate the variants on every repeat so both see the same machine load
+            for _ in range(repeats):
+                for name, func in (("interact", sim.interact), ("ratio", _ratio_strength_interact)):
+                    original, sim.interact = sim.interact, func # run_batch looks interact up at call time
+                    try:
+                        start = time.perf_counter()
+                        results[name] = sim.run_batch(civs, num_turns, seed=seed)
+                        timings[name] = min(timings[name], time.perf_counter() - start)
+                    finally:
+                        sim.interact = original
+            for name in totals:
+                totals[name] += timings[name]
+            identical = all(np.array_equal(results["interact"][field], results["ratio"][field], equal_nan=True)
+                            for field in ("pop", "res", "tech", "alive"))
+            print(f"{label} ({np.dtype(dtype).name}): interact {timings['interact'] * 1e3:.1f} ms, "
+                  f"ratio {timings['ratio'] * 1e3:.1f} ms ({timings['ratio'] / timings['interact']:.2f}x); identical {identical}")
+    print(f"Aggregate: interact {totals['interact'] * 1e3:.1f} ms, ratio {totals['ratio'] * 1e3:.1f} ms "
+          f"({totals['ratio'] / totals['interact']:.2f}x)")
+
+if __name__ == "__main__":
+    for num_turns in (50, 100):
+        bench_precision(num_turns=num_turns)
+    bench_tech_lut()
+    bench_strength_cache()
+    bench_log_strength()
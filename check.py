@@ -0,0 +1,114 @@
+"""Consistency checks for code paths and shortcuts that claim to give identical results.
+
+Run with:  python check.py
+"""
+import sys
+import warnings
+
+import numpy as np
+
+import sim
+
+TRAITS = [
+    ((8, 7, 2, 8), (4, 3, 9, 2)),
+    ((5, 5, 1, 3), (5, 5, 2, 3)),
+    ((5, 5, 3, 6), (5, 5, 3, 6)),
+    ((6, 4, 1, 2), (5, 5, 5, 3)),
+    ((2, 2, 1, 3), (3, 2, 1, 2)),
+    ((6, 6, 4, 4), (5, 5, 4, 8)),
+]
+
+def final_state(civ1, civ2):
+    """(pop, res, tech, alive) of both civs as a float array, for NaN-aware comparison."""
+    return np.array([[civ.population, civ.resources, civ.tech_level, civ.is_alive] for civ in (civ1, civ2)], dtype=float)
+
+def check_event_driven(seeds=range(50), turn_counts=(40, 100)):
+    """run_event_driven against run_simulation: same final state and events for every seed and matchup."""
+    mismatches = 0
+    for traits1, traits2 in TRAITS:
+        for seed in seeds:
+            for num_turns in turn_counts:
+                runs = []
+                for run in (sim.run_simulation, sim.run_event_driven):
+                    civ1, civ2 = sim.Civilization("Civ 1", *traits1), sim.Civilization("Civ 2", *traits2)
+                    events = []
+                    run(civ1, civ2, num_turns, events, seed)
+                    runs.append((final_state(civ1, civ2), repr(events)))
+                (state_a, events_a), (state_b, events_b) = runs
+                if not np.array_equal(state_a, state_b, equal_nan=True) or events_a != events_b:
+                    mismatches += 1
+                    print(f"  mismatch: {traits1} vs {traits2}, seed {seed}, {num_turns} turns")
+    print(f"run_event_driven vs run_simulation: {mismatches} mismatches")
+    return mismatches == 0
+
+def check_kernel(seeds=range(100), num_turns=100):
+    """sim_kernel.run_c against run_simulation on the same draws; skipped if the Cython kernel isn't built."""
+    try:
+        import sim_kernel
+    except ImportError:
+        print("sim_kernel vs run_simulation: skipped (build with cythonize -i sim_kernel.pyx)")
+        return True
+    mismatches = 0
+    for traits1, traits2 in TRAITS:
+        states = [(sim_kernel.CivState(*traits1), sim_kernel.CivState(*traits2)) for _ in seeds]
+        # run_simulation draws its (num_turns, 6) block from default_rng(seed); hand run_c the same blocks
+        rnd = np.stack([np.random.default_rng(seed).random((num_turns, 6)) for seed in seeds])
+        sim_kernel.run_c(states, num_turns, rnd)
+        for seed, (state1, state2) in zip(seeds, states):
+            civ1, civ2 = sim.Civilization("Civ 1", *traits1), sim.Civilization("Civ 2", *traits2)
+            sim.run_simulation(civ1, civ2, num_turns, seed=seed)
+            if not np.array_equal(final_state(state1, state2), final_state(civ1, civ2), equal_nan=True):
+                mismatches += 1
+                print(f"  mismatch: {traits1} vs {traits2}, seed {seed}")
+    print(f"sim_kernel vs run_simulation: {mismatches} mismatches")
+    return mismatches == 0
+
+def check_overwhelming_force(n=20000, seed=0):
+    """The overwhelming-force shortcut in _interaction_phase against the full defender loss formula, near its threshold.
+
+    Samples concentrate on the guard's worst case: defender strength just
+    above 1, tech near the guard's limit, attacker just past the ratio and
+    low u[4] rolls. Losses are read from the conflict event, so a defender
+    eliminated afterwards is still compared.
+    """
+    rng = np.random.default_rng(seed)
+    tech_limit = (sim._OVERWHELMED_LOSS_MULT / 0.9 - 1) / 0.1 # Highest defender tech the guard lets through
+    fired = mismatches = 0
+    for _ in range(n):
+        attacker, defender = sim.Civilization("Attacker", 5, 5, 10, 0), sim.Civilization("Defender", 5, 5, 9, 0)
+        if rng.random() < 0.5:
+            # Worst corner: strength barely 1, tech straddling the limit the guard allows
+            defender.tech_level = max(0.05, tech_limit + rng.uniform(-2, 1))
+            s_defender = 1 + 10 ** rng.uniform(-9, 0)
+        else:
+            defender.tech_level = rng.uniform(0.05, 30)
+            s_defender = 10 ** rng.uniform(0, 3)
+        defender.population = s_defender / defender.tech_level ** sim.TECH_COMBAT_FACTOR
+        defender.resources = rng.uniform(0, 1e6)
+        attacker.tech_level = rng.uniform(1, 30)
+        ratio = sim.OVERWHELMING_FORCE_RATIO * (1 + 10 ** rng.uniform(-12, 0))
+        attacker.population = defender.calculate_strength() * ratio / attacker.tech_level ** sim.TECH_COMBAT_FACTOR
+        attacker.resources = rng.uniform(0, 1e6)
+        u = [0.0, 0.0, 0.0, rng.random(), 10 ** rng.uniform(-9, 0), 0.0]
+
+        s_attacker, s_defender = attacker.calculate_strength(), defender.calculate_strength()
+        pop, res, tech_factor = defender.population, defender.resources, 1 + defender.tech_level * 0.1
+        fired += (s_defender >= 1 and s_attacker > s_defender * sim.OVERWHELMING_FORCE_RATIO
+                  and tech_factor * 0.9 <= sim._OVERWHELMED_LOSS_MULT)
+        # Full formula, as used when the shortcut does not fire
+        effective = s_defender / (1 + max(0, (s_attacker / (s_defender + 1) - 1)))
+        loss_mult = sim.COMBAT_LOSS_BASE * (1 + s_attacker / (effective + 1)) * (0.7 + 0.6 * u[4])
+        expected = (min(pop * 0.9, pop * loss_mult * (1 / tech_factor)), min(res * 0.9, res * loss_mult * tech_factor))
+
+        events = []
+        sim._interaction_phase(sim.CivPair(attacker, defender), 1, u, events)
+        if tuple(events[0][-2:]) != expected:
+            mismatches += 1
+            print(f"  mismatch: s_attacker {s_attacker!r}, s_defender {s_defender!r}, tech {defender.tech_level!r}, u4 {u[4]!r}")
+    print(f"overwhelming-force shortcut vs full loss formula: {mismatches} mismatches ({fired} of {n} cases took the shortcut)")
+    return mismatches == 0
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", RuntimeWarning) # Long runs overflow to inf/nan by design
+    checks = [check_event_driven, check_kernel, check_overwhelming_force]
+    sys.exit(0 if all([check() for check in checks]) else 1)
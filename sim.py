@@ -1,5 +1,19 @@
-import random
+import heapq
 import math
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError: # Numba is optional; the JIT kernels then run as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # --- Simulation Constants ---
 INITIAL_POPULATION = 1000
@@ -23,28 +37,40 @@ TECH_RESOURCE_COST = 50   # Resources needed per tech point research
 STRENGTH_ADVANTAGE_FACTOR = 1.2 # How much stronger attacker needs to be for easy win
 COMBAT_LOSS_BASE = 0.1        # Base percentage loss in combat
 TECH_COMBAT_FACTOR = 1.5      # How much tech level influences combat strength exponent
+OVERWHELMING_FORCE_RATIO = 50 # Attacker/defender strength ratio beyond which the defender's losses always hit the cap
+# Smallest defender loss multiplier past that ratio (defender strength >= 1, lowest roll); check.py tests the guard
+_OVERWHELMED_LOSS_MULT = COMBAT_LOSS_BASE * 0.7 * (1 + OVERWHELMING_FORCE_RATIO ** 2 / (OVERWHELMING_FORCE_RATIO + 2))
 
 # Cooperation Benefits
 COOP_RESOURCE_BONUS = 0.05   # % resource bonus from cooperation
 COOP_TECH_BONUS = 0.02       # Flat tech points bonus from cooperation
 
+# Output
+VERBOSE = False  # Print turn-by-turn narration (slow for large batches and sweeps)
+
+@dataclass(slots=True, eq=False)
 class Civilization:
     """Represents a single civilization in the simulation."""
 
-    def __init__(self, name, intelligence, tech_rate, aggressiveness, cooperation):
-        self.name = name
+    name: str
 
-        # Core Characteristics (Scale often 1-10, but can be adjusted)
-        self.intelligence = max(1, intelligence) # Min 1 to avoid zero division/multiplication issues
-        self.tech_rate = max(0.1, tech_rate)     # Min 0.1
-        self.aggressiveness = max(0, aggressiveness)
-        self.cooperation = max(0, cooperation)
+    # Core Characteristics (Scale often 1-10, but can be adjusted)
+    intelligence: float
+    tech_rate: float
+    aggressiveness: float
+    cooperation: float
 
-        # State Variables
-        self.population = INITIAL_POPULATION
-        self.resources = INITIAL_RESOURCES
-        self.tech_level = INITIAL_TECH_LEVEL
-        self.is_alive = True
+    # State Variables
+    population: float = field(default=INITIAL_POPULATION, init=False)
+    resources: float = field(default=INITIAL_RESOURCES, init=False)
+    tech_level: float = field(default=INITIAL_TECH_LEVEL, init=False)
+    is_alive: bool = field(default=True, init=False)
+
+    def __post_init__(self):
+        self.intelligence = max(1, self.intelligence) # Min 1 to avoid zero division/multiplication issues
+        self.tech_rate = max(0.1, self.tech_rate)     # Min 0.1
+        self.aggressiveness = max(0, self.aggressiveness)
+        self.cooperation = max(0, self.cooperation)
 
     def calculate_strength(self):
         """Calculates the overall strength, heavily influenced by tech."""
@@ -53,62 +79,44 @@ class Civilization:
         # Tech has an exponential impact on strength
         return self.population * (self.tech_level ** TECH_COMBAT_FACTOR)
 
-    def gather_resources(self):
-        """Gather resources based on population and tech level."""
+    def internal_phase(self):
+        """Gathers and consumes resources, grows population and develops technology in a single pass."""
         if not self.is_alive:
             return
-        gathered = self.population * RESOURCE_GATHER_BASE * (1 + self.tech_level / 10.0) # Tech improves gathering
-        self.resources += gathered
-        # print(f"{self.name} gathered {gathered:.2f} resources.") # DEBUG
+        pop, res, tech = self.population, self.resources, self.tech_level
 
-    def consume_resources(self):
-        """Consume resources based on population."""
-        if not self.is_alive:
-            return
-        consumed = self.population * POP_RESOURCE_COST
-        self.resources -= consumed
-        # print(f"{self.name} consumed {consumed:.2f} resources.") # DEBUG
-        if self.resources < 0:
+        # Gather resources based on population and tech level, then consume before growth
+        res += pop * RESOURCE_GATHER_BASE * (1 + tech / 10.0) # Tech improves gathering
+        res -= pop * POP_RESOURCE_COST
+        if res < 0:
             # Starvation/Resource Depletion leads to population decline
-            deficit = abs(self.resources)
-            pop_loss = min(self.population, deficit / POP_RESOURCE_COST * 1.5) # Lose pop faster than normal consumption
-            print(f"*** {self.name} suffers resource shortage! Loses {pop_loss:.0f} population. ***")
-            self.population -= pop_loss
-            self.resources = 0
-            if self.population <= 0:
+            pop_loss = min(pop, -res / POP_RESOURCE_COST * 1.5) # Lose pop faster than normal consumption
+            if VERBOSE: print(f"*** {self.name} suffers resource shortage! Loses {pop_loss:.0f} population. ***")
+            pop -= pop_loss
+            res = 0
+            if pop <= 0:
                 self.die(f"starvation due to resource depletion")
+                return
 
-    def grow_population(self):
-        """Grow population if resources allow."""
-        if not self.is_alive or self.resources <= 0:
-            return
-
-        # Growth influenced by resources available beyond basic needs
-        resource_factor = max(0, 1 + (self.resources / (self.population * POP_RESOURCE_COST * 5 + 1))) # Simple bonus factor
-        growth = self.population * POP_GROWTH_RATE_BASE * resource_factor * (1 + self.cooperation / 20.0) # Cooperation slightly helps internal growth/stability
-        self.population += growth
-        # print(f"{self.name} population grew by {growth:.0f}.") # DEBUG
-
-    def develop_technology(self):
-        """Improve technology based on intelligence and tech rate, consuming resources."""
-        if not self.is_alive or self.resources < TECH_RESOURCE_COST: # Need minimum resources to research
-            return
-
-        # Tech gain influenced by intelligence, base rate, and current tech (diminishing returns)
-        tech_points_potential = self.intelligence * self.tech_rate * TECH_IMPROVEMENT_BASE * (self.population / 1000.0) # More pop = more potential researchers
-        tech_points_potential /= (1 + self.tech_level * 0.1) # Harder to advance at higher tech levels
+        # Grow population if resources allow; growth is influenced by resources available beyond basic needs
+        if res > 0:
+            resource_factor = max(0, 1 + (res / (pop * POP_RESOURCE_COST * 5 + 1))) # Simple bonus factor
+            pop += pop * POP_GROWTH_RATE_BASE * resource_factor * (1 + self.cooperation / 20.0) # Cooperation slightly helps internal growth/stability
 
-        # Spend resources on research
-        resources_to_spend = min(self.resources, tech_points_potential * TECH_RESOURCE_COST)
-        tech_points_gained = resources_to_spend / TECH_RESOURCE_COST
+        # Improve technology, consuming resources (need minimum resources to research)
+        if res >= TECH_RESOURCE_COST:
+            # Tech gain influenced by intelligence, base rate, and current tech (diminishing returns)
+            tech_points_potential = self.intelligence * self.tech_rate * TECH_IMPROVEMENT_BASE * (pop / 1000.0) # More pop = more potential researchers
+            tech_points_potential /= (1 + tech * 0.1) # Harder to advance at higher tech levels
+            resources_to_spend = min(res, tech_points_potential * TECH_RESOURCE_COST)
+            res -= resources_to_spend
+            tech += resources_to_spend / TECH_RESOURCE_COST
 
-        self.resources -= resources_to_spend
-        self.tech_level += tech_points_gained
-        # print(f"{self.name} spent {resources_to_spend:.2f} resources to gain {tech_points_gained:.4f} tech points.") # DEBUG
+        self.population, self.resources, self.tech_level = pop, res, tech
 
     def die(self, reason="elimination"):
         """Marks the civilization as no longer active."""
-        print(f"*** {self.name} has been eliminated due to {reason}! ***")
+        if VERBOSE: print(f"*** {self.name} has been eliminated due to {reason}! ***")
         self.is_alive = False
         self.population = 0
         self.resources = 0
@@ -121,151 +129,725 @@ class Civilization:
         else:
             print(f"{self.name}: Pop={self.population:.0f}, Res={self.resources:.0f}, Tech={self.tech_level:.3f}, Str={self.calculate_strength():.0f}")
 
-# --- Simulation Logic ---
+@dataclass(slots=True, eq=False)
+class CivPair:
+    """The two civilizations of a matchup, with the trait-only terms of the interaction checks precomputed."""
 
-def run_simulation(civ1, civ2, num_turns):
-    """Runs the main simulation loop."""
-    print("--- Starting Simulation ---")
-    civ1.display_status()
-    civ2.display_status()
-    print("-" * 20)
+    civ1: Civilization
+    civ2: Civilization
 
-    for turn in range(1, num_turns + 1):
-        print(f"\n--- Turn {turn} ---")
+    # Aggressiveness and cooperation never change, so these are fixed for the whole run
+    combined_agg: float = field(init=False)
+    combined_coop: float = field(init=False)
+    # The randomized checks combined > THRESHOLD * (0.8 + 0.4 * u) pass exactly when u < cut
+    fight_cut: float = field(init=False, repr=False)
+    coop_cut: float = field(init=False, repr=False)
 
-        # --- Internal Phase (Growth, Research) ---
-        for civ in [civ1, civ2]:
-            if civ.is_alive:
-                civ.gather_resources()
-                civ.consume_resources() # Consume before growth
-                if civ.is_alive: # Check again after consumption/starvation
-                    civ.grow_population()
-                    civ.develop_technology()
+    def __post_init__(self):
+        self.combined_agg = self.civ1.aggressiveness + self.civ2.aggressiveness
+        self.combined_coop = self.civ1.cooperation + self.civ2.cooperation
+        self.fight_cut = (self.combined_agg / CONFLICT_THRESHOLD_AGG - 0.8) / 0.4
+        self.coop_cut = (self.combined_coop / COOPERATION_THRESHOLD_COOP - 0.8) / 0.4
 
-        # Check if a civ died during internal phase
-        if not civ1.is_alive or not civ2.is_alive:
-            civ1.display_status()
-            civ2.display_status()
-            print("--- Simulation Ended: One civilization eliminated ---")
-            break # End simulation if one is dead
+# --- Simulation Logic ---
 
-        # --- Interaction Phase ---
-        interaction_occurred = False
-        strength1 = civ1.calculate_strength()
-        strength2 = civ2.calculate_strength()
-        combined_agg = civ1.aggressiveness + civ2.aggressiveness
-        combined_coop = civ1.cooperation + civ2.cooperation
-
-        # Determine relative strength
-        stronger_civ = None
-        weaker_civ = None
-        strength_ratio = 1.0
-        if strength1 > strength2 and strength2 > 0:
-            strength_ratio = strength1 / strength2
-            stronger_civ = civ1
-            weaker_civ = civ2
-        elif strength2 > strength1 and strength1 > 0:
-            strength_ratio = strength2 / strength1
-            stronger_civ = civ2
-            weaker_civ = civ1
-
-        # 1. Conflict Check
-        # More likely if combined aggression is high, or if one is much stronger and aggressive
-        will_fight = False
-        if combined_agg > CONFLICT_THRESHOLD_AGG * (random.uniform(0.8, 1.2)): # Add some randomness
-            will_fight = True
-        elif stronger_civ and stronger_civ.aggressiveness > (weaker_civ.aggressiveness + 3) and strength_ratio > STRENGTH_DIFF_AGG_MOD:
-             # Much stronger civ is significantly more aggressive -> Opportunistic attack
-             if random.random() < (stronger_civ.aggressiveness / 10.0): # Chance based on aggressor's aggression
-                 will_fight = True
-
-        if will_fight:
-            interaction_occurred = True
-            print(f"Interaction: Conflict between {civ1.name} and {civ2.name}!")
-
-            # Determine Attacker (more aggressive one, or random if equal)
-            attacker = None
-            defender = None
-            if civ1.aggressiveness > civ2.aggressiveness:
-                attacker, defender = civ1, civ2
-            elif civ2.aggressiveness > civ1.aggressiveness:
-                attacker, defender = civ2, civ1
-            else:
-                 attacker, defender = random.sample([civ1, civ2], 2)
-
-            print(f"{attacker.name} (Str {attacker.calculate_strength():.0f}) attacks {defender.name} (Str {defender.calculate_strength():.0f})")
-
-            # Combat Resolution (Simplified)
-            s_attacker = attacker.calculate_strength()
-            s_defender = defender.calculate_strength()
-
-            # Calculate loss multipliers (based on strength difference and randomness)
-            # Advantage reduces defender's effective strength for loss calculation
-            defender_effective_strength = s_defender / (1 + max(0, (s_attacker / (s_defender + 1) - 1))) # +1 avoids div by zero
-            attacker_loss_mult = COMBAT_LOSS_BASE * (1 + defender_effective_strength / (s_attacker + 1)) * random.uniform(0.7, 1.3)
-            defender_loss_mult = COMBAT_LOSS_BASE * (1 + s_attacker / (defender_effective_strength + 1)) * random.uniform(0.7, 1.3)
-
-            # Apply losses (higher tech means less proportional pop loss, more resource loss)
-            attacker_pop_loss = attacker.population * attacker_loss_mult * (1 / (1 + attacker.tech_level * 0.1))
-            attacker_res_loss = attacker.resources * attacker_loss_mult * (1 + attacker.tech_level * 0.1)
-
-            defender_pop_loss = defender.population * defender_loss_mult * (1 / (1 + defender.tech_level * 0.1))
-            defender_res_loss = defender.resources * defender_loss_mult * (1 + defender.tech_level * 0.1)
-
-            # Cap losses
-            attacker_pop_loss = min(attacker.population * 0.9, attacker_pop_loss) # Max 90% loss in one go
-            attacker_res_loss = min(attacker.resources * 0.9, attacker_res_loss)
-            defender_pop_loss = min(defender.population * 0.9, defender_pop_loss)
-            defender_res_loss = min(defender.resources * 0.9, defender_res_loss)
-
-            attacker.population -= attacker_pop_loss
-            attacker.resources -= attacker_res_loss
-            defender.population -= defender_pop_loss
-            defender.resources -= defender_res_loss
+def _internal_phase(*civs):
+    """Runs the growth and research phase for each surviving civ."""
+    for civ in civs:
+        civ.internal_phase()
+
+def _starvation_ended(civ1, civ2, turn, events=None):
+    """Reports a civ lost during the internal phase. Returns True if the simulation is over."""
+    if civ1.is_alive and civ2.is_alive:
+        return False
+    if events is not None:
+        events.extend((turn, "eliminated", civ.name, "starvation") for civ in (civ1, civ2) if not civ.is_alive)
+    if VERBOSE:
+        civ1.display_status()
+        civ2.display_status()
+        print("--- Simulation Ended: One civilization eliminated ---")
+    return True
+
+def _interaction_phase(pair, turn, u, events=None):
+    """Resolves conflict or cooperation between the two living civs of pair for one turn.
+
+    u holds the turn's six uniform draws. Returns True if the civs interacted.
+    """
+    civ1, civ2 = pair.civ1, pair.civ2
+    interaction_occurred = False
+    # Strength only changes through the internal phase, so compute it once and reuse it below
+    strength1 = civ1.calculate_strength()
+    strength2 = civ2.calculate_strength()
+
+    # Determine relative strength
+    stronger_civ = None
+    weaker_civ = None
+    strength_ratio = 1.0
+    if strength1 > strength2 and strength2 > 0:
+        strength_ratio = strength1 / strength2
+        stronger_civ = civ1
+        weaker_civ = civ2
+    elif strength2 > strength1 and strength1 > 0:
+        strength_ratio = strength2 / strength1
+        stronger_civ = civ2
+        weaker_civ = civ1
+
+    # 1. Conflict Check
+    # More likely if combined aggression is high, or if one is much stronger and aggressive
+    will_fight = False
+    if u[0] < pair.fight_cut: # Randomized threshold, see CivPair
+        will_fight = True
+    elif stronger_civ and stronger_civ.aggressiveness > (weaker_civ.aggressiveness + 3) and strength_ratio > STRENGTH_DIFF_AGG_MOD:
+         # Much stronger civ is significantly more aggressive -> Opportunistic attack
+         if u[1] < (stronger_civ.aggressiveness / 10.0): # Chance based on aggressor's aggression
+             will_fight = True
+
+    if will_fight:
+        interaction_occurred = True
+        if VERBOSE: print(f"Interaction: Conflict between {civ1.name} and {civ2.name}!")
+
+        # Determine Attacker (more aggressive one, or a coin flip if equal)
+        agg1, agg2 = civ1.aggressiveness, civ2.aggressiveness
+        if agg1 > agg2 or (agg1 == agg2 and u[2] < 0.5):
+            attacker, defender, s_attacker, s_defender = civ1, civ2, strength1, strength2
+        else:
+            attacker, defender, s_attacker, s_defender = civ2, civ1, strength2, strength1
+
+        if VERBOSE: print(f"{attacker.name} (Str {s_attacker:.0f}) attacks {defender.name} (Str {s_defender:.0f})")
+
+        # Combat Resolution (Simplified)
+
+        # Calculate loss multipliers (based on strength difference and randomness)
+        # Advantage reduces defender's effective strength for loss calculation
+        defender_effective_strength = s_defender / (1 + max(0, (s_attacker / (s_defender + 1) - 1))) # +1 avoids div by zero
+        attacker_loss_mult = COMBAT_LOSS_BASE * (1 + defender_effective_strength / (s_attacker + 1)) * (0.7 + 0.6 * u[3])
+
+        # Apply losses (higher tech means less proportional pop loss, more resource loss)
+        attacker_tech_factor = 1 + attacker.tech_level * 0.1
+        defender_tech_factor = 1 + defender.tech_level * 0.1
+        attacker_pop_loss = attacker.population * attacker_loss_mult * (1 / attacker_tech_factor)
+        attacker_res_loss = attacker.resources * attacker_loss_mult * attacker_tech_factor
+
+        # Cap losses
+        attacker_pop_loss = min(attacker.population * 0.9, attacker_pop_loss) # Max 90% loss in one go
+        attacker_res_loss = min(attacker.resources * 0.9, attacker_res_loss)
+        if (s_defender >= 1 and s_attacker > s_defender * OVERWHELMING_FORCE_RATIO
+                and defender_tech_factor * 0.9 <= _OVERWHELMED_LOSS_MULT):
+            # Overwhelming force: whatever the roll, the defender's losses are capped, so skip its multiplier
+            defender_pop_loss = defender.population * 0.9
+            defender_res_loss = defender.resources * 0.9
+        else:
+            defender_loss_mult = COMBAT_LOSS_BASE * (1 + s_attacker / (defender_effective_strength + 1)) * (0.7 + 0.6 * u[4])
+            defender_pop_loss = min(defender.population * 0.9, defender.population * defender_loss_mult * (1 / defender_tech_factor))
+            defender_res_loss = min(defender.resources * 0.9, defender.resources * defender_loss_mult * defender_tech_factor)
 
+        attacker.population -= attacker_pop_loss
+        attacker.resources -= attacker_res_loss
+        defender.population -= defender_pop_loss
+        defender.resources -= defender_res_loss
+
+        if VERBOSE:
             print(f"Outcome: {attacker.name} loses {attacker_pop_loss:.0f} pop, {attacker_res_loss:.0f} res. "
                   f"{defender.name} loses {defender_pop_loss:.0f} pop, {defender_res_loss:.0f} res.")
+        if events is not None:
+            events.append((turn, "conflict", attacker.name, defender.name, s_attacker, s_defender,
+                           attacker_pop_loss, attacker_res_loss, defender_pop_loss, defender_res_loss))
+
+        # Check for elimination post-combat
+        for civ in (attacker, defender):
+            if civ.population <= 1 or civ.resources < 0:
+                civ.die("combat losses")
+                if events is not None: events.append((turn, "eliminated", civ.name, "combat losses"))
+
+
+    # 2. Cooperation Check (only if no conflict occurred)
+    elif u[5] < pair.coop_cut:
+        interaction_occurred = True
+        if VERBOSE: print(f"Interaction: Cooperation between {civ1.name} and {civ2.name}!")
+
+        # Simple benefits: resource gain and slight tech boost
+        res_bonus1 = civ1.resources * COOP_RESOURCE_BONUS * (civ2.cooperation / 10.0) # More cooperative partner gives better bonus
+        res_bonus2 = civ2.resources * COOP_RESOURCE_BONUS * (civ1.cooperation / 10.0)
+        tech_bonus1 = COOP_TECH_BONUS * (civ2.intelligence / 5.0) # More intelligent partner shares more effectively
+        tech_bonus2 = COOP_TECH_BONUS * (civ1.intelligence / 5.0)
+
+        civ1.resources += res_bonus1
+        civ2.resources += res_bonus2
+        civ1.tech_level += tech_bonus1
+        civ2.tech_level += tech_bonus2
+
+        if VERBOSE:
+            print(f"Outcome: {civ1.name} gains {res_bonus1:.0f} res, {tech_bonus1:.4f} tech. "
+                  f"{civ2.name} gains {res_bonus2:.0f} res, {tech_bonus2:.4f} tech.")
+        if events is not None:
+            events.append((turn, "cooperation", civ1.name, civ2.name, res_bonus1, tech_bonus1, res_bonus2, tech_bonus2))
+
+    # 3. No Interaction
+    if VERBOSE and not interaction_occurred:
+        print("Interaction: None this turn.")
+    return interaction_occurred
+
+def run_simulation(civ1, civ2, num_turns, events=None, seed=None):
+    """Runs the main simulation loop.
+
+    Narration is only printed when VERBOSE is set. Pass a list as events to
+    collect (turn, kind, ...) tuples instead; format_events() renders them.
+    All randomness comes from np.random.default_rng(seed), drawn up front.
+    """
+    # One uniform [0, 1) draw per random decision per turn, converted to plain floats for the scalar loop
+    draws = np.random.default_rng(seed).random((num_turns, 6)).tolist()
+    pair = CivPair(civ1, civ2)
+
+    if VERBOSE:
+        print("--- Starting Simulation ---")
+        civ1.display_status()
+        civ2.display_status()
+        print("-" * 20)
 
-            # Check for elimination post-combat
-            if attacker.population <= 1 or attacker.resources < 0: attacker.die("combat losses")
-            if defender.population <= 1 or defender.resources < 0: defender.die("combat losses")
-
-
-        # 2. Cooperation Check (only if no conflict occurred)
-        elif combined_coop > COOPERATION_THRESHOLD_COOP * (random.uniform(0.8, 1.2)):
-            interaction_occurred = True
-            print(f"Interaction: Cooperation between {civ1.name} and {civ2.name}!")
-
-            # Simple benefits: resource gain and slight tech boost
-            res_bonus1 = civ1.resources * COOP_RESOURCE_BONUS * (civ2.cooperation / 10.0) # More cooperative partner gives better bonus
-            res_bonus2 = civ2.resources * COOP_RESOURCE_BONUS * (civ1.cooperation / 10.0)
-            tech_bonus1 = COOP_TECH_BONUS * (civ2.intelligence / 5.0) # More intelligent partner shares more effectively
-            tech_bonus2 = COOP_TECH_BONUS * (civ1.intelligence / 5.0)
+    for turn in range(1, num_turns + 1):
+        if VERBOSE: print(f"\n--- Turn {turn} ---")
+        u = draws[turn - 1]
 
-            civ1.resources += res_bonus1
-            civ2.resources += res_bonus2
-            civ1.tech_level += tech_bonus1
-            civ2.tech_level += tech_bonus2
+        # --- Internal Phase (Growth, Research) ---
+        _internal_phase(civ1, civ2)
 
-            print(f"Outcome: {civ1.name} gains {res_bonus1:.0f} res, {tech_bonus1:.4f} tech. "
-                  f"{civ2.name} gains {res_bonus2:.0f} res, {tech_bonus2:.4f} tech.")
+        # Check if a civ died during internal phase
+        if _starvation_ended(civ1, civ2, turn, events):
+            break # End simulation if one is dead
 
-        # 3. No Interaction
-        if not interaction_occurred:
-            print("Interaction: None this turn.")
+        # --- Interaction Phase ---
+        _interaction_phase(pair, turn, u, events)
 
-        # --- Display Status ---
-        civ1.display_status()
-        civ2.display_status()
+        if VERBOSE:
+            # --- Display Status ---
+            civ1.display_status()
+            civ2.display_status()
 
         # --- Check End Conditions ---
         if not civ1.is_alive or not civ2.is_alive:
-            print("--- Simulation Ended: One civilization eliminated ---")
+            if VERBOSE: print("--- Simulation Ended: One civilization eliminated ---")
             break
         if turn == num_turns:
-            print(f"--- Simulation Ended: Reached turn limit ({num_turns}) ---")
+            if VERBOSE: print(f"--- Simulation Ended: Reached turn limit ({num_turns}) ---")
             break
 
+# --- Event-Driven Scheduling ---
+# In sparse regimes (traits that keep both interaction checks out of reach)
+# nothing but internal growth happens for long stretches. run_event_driven
+# keeps the next possible event per kind in a heap and only runs the
+# interaction phase on turns where something can actually happen.
+
+def next_interaction_time(civ1, civ2):
+    """Turns until the pair could next interact: 0 if any check might pass this turn, math.inf if none ever can."""
+    # Aggressiveness and cooperation never change, so the randomized thresholds are either reachable or not
+    if civ1.aggressiveness + civ2.aggressiveness > CONFLICT_THRESHOLD_AGG * 0.8:
+        return 0
+    if civ1.cooperation + civ2.cooperation > COOPERATION_THRESHOLD_COOP * 0.8:
+        return 0
+    if abs(civ1.aggressiveness - civ2.aggressiveness) > 3:
+        return 0 # Opportunistic attacks hinge on the strength ratio, which changes every turn
+    return math.inf
+
+def next_death_time(civ):
+    """Turns until civ runs out of resources at its current net gather rate (math.inf if its stock is growing).
+
+    With the current constants every person gathers at least
+    RESOURCE_GATHER_BASE (0.5) and consumes POP_RESOURCE_COST (0.1), so a
+    living civ's stock never shrinks in the internal phase and this is
+    always math.inf; the starvation events only matter if those change.
+    """
+    if not civ.is_alive:
+        return 0
+    net_gain = civ.population * (RESOURCE_GATHER_BASE * (1 + civ.tech_level / 10.0) - POP_RESOURCE_COST)
+    if net_gain >= 0:
+        return math.inf
+    return civ.resources / -net_gain
+
+def run_event_driven(civ1, civ2, num_turns, events=None, seed=None):
+    """Runs the same model as run_simulation, but skips the interaction phase while no interaction is possible.
+
+    Growth has no closed form, so dead turns still run the internal phase,
+    but as a tight compiled loop per civ (simulate_isolated) rather than one
+    Python turn at a time. Uses the same per-turn draws as run_simulation, so
+    results match for a given seed. Returns the number of turns on which the
+    interaction phase ran.
+    """
+    draws = np.random.default_rng(seed).random((num_turns, 6)).tolist()
+    pair = CivPair(civ1, civ2)
+    turn = 0
+    interaction_turns = 0
+
+    while turn < num_turns:
+        queue = [(num_turns, "turn limit")]
+        heapq.heappush(queue, (turn + 1 + next_interaction_time(civ1, civ2), "interaction"))
+        for civ in (civ1, civ2):
+            death_time = next_death_time(civ)
+            if death_time < math.inf:
+                heapq.heappush(queue, (turn + max(1, math.ceil(death_time)), "starvation"))
+        event_turn, kind = heapq.heappop(queue)
+        event_turn = min(event_turn, num_turns)
+
+        # Dead time: advance on internal growth alone up to the event, one compiled call per civ
+        quiet_until = event_turn - 1 if kind == "interaction" else event_turn
+        if quiet_until > turn:
+            if VERBOSE: print(f"\n--- Turns {turn + 1}-{quiet_until}: no interaction possible ---")
+            # Both civs must stop at the same turn: the one that can go furthest without starving is
+            # only replayed if the other stops sooner, otherwise each window is computed once
+            runs = [_simulate_isolated(*_isolated_args(civ), quiet_until - turn) for civ in (civ1, civ2)]
+            safe_turns = min(run[3] for run in runs)
+            for civ, (pop, res, tech, turns) in zip((civ1, civ2), runs):
+                if turns == safe_turns:
+                    civ.population, civ.resources, civ.tech_level = pop, res, tech
+                else:
+                    simulate_isolated(civ, safe_turns)
+            turn += safe_turns
+            if turn < quiet_until:
+                # A civ starves on the next turn; run it normally so it is reported
+                # (unreachable under the current constants, see next_death_time)
+                turn += 1
+                _internal_phase(civ1, civ2)
+                if _starvation_ended(civ1, civ2, turn, events):
+                    return interaction_turns
+                continue
+
+        if kind == "interaction":
+            turn += 1
+            if VERBOSE: print(f"\n--- Turn {turn} ---")
+            _internal_phase(civ1, civ2)
+            if _starvation_ended(civ1, civ2, turn, events):
+                return interaction_turns
+            _interaction_phase(pair, turn, draws[turn - 1], events)
+            interaction_turns += 1
+            if VERBOSE:
+                civ1.display_status()
+                civ2.display_status()
+            if not civ1.is_alive or not civ2.is_alive:
+                if VERBOSE: print("--- Simulation Ended: One civilization eliminated ---")
+                return interaction_turns
+
+    if VERBOSE: print(f"--- Simulation Ended: Reached turn limit ({num_turns}) ---")
+    return interaction_turns
+
+def format_events(events):
+    """Renders the event tuples collected by run_simulation as readable lines."""
+    lines = []
+    for turn, kind, *details in events:
+        if kind == "conflict":
+            attacker, defender, s_attacker, s_defender, a_pop, a_res, d_pop, d_res = details
+            lines.append(f"Turn {turn}: {attacker} (Str {s_attacker:.0f}) attacks {defender} (Str {s_defender:.0f}). "
+                         f"{attacker} loses {a_pop:.0f} pop, {a_res:.0f} res. {defender} loses {d_pop:.0f} pop, {d_res:.0f} res.")
+        elif kind == "cooperation":
+            name1, name2, res1, tech1, res2, tech2 = details
+            lines.append(f"Turn {turn}: Cooperation between {name1} and {name2}. "
+                         f"{name1} gains {res1:.0f} res, {tech1:.4f} tech. {name2} gains {res2:.0f} res, {tech2:.4f} tech.")
+        elif kind == "eliminated":
+            name, reason = details
+            lines.append(f"Turn {turn}: {name} has been eliminated due to {reason}.")
+    return lines
+
+# --- Parameter Sweeps ---
+# Independent matchups are farmed out to a process pool. A parameter set is
+# a pair of (intelligence, tech_rate, aggressiveness, cooperation) tuples.
+
+def _run_one(civ1_params, civ2_params, num_turns, seed):
+    """Runs one matchup and returns (pop1, res1, tech1, pop2, res2, tech2, winner).
+
+    winner is 0 or 1 for the surviving (or, if both survive, stronger) civ and
+    None for a draw or mutual elimination.
+    """
+    civ1 = Civilization("Civ 1", *civ1_params)
+    civ2 = Civilization("Civ 2", *civ2_params)
+    run_simulation(civ1, civ2, num_turns, seed=seed)
+
+    s1, s2 = civ1.calculate_strength(), civ2.calculate_strength()
+    winner = 0 if s1 > s2 else 1 if s2 > s1 else None
+    return (civ1.population, civ1.resources, civ1.tech_level,
+            civ2.population, civ2.resources, civ2.tech_level, winner)
+
+def run_sweep(param_grid, num_turns, n_workers=None, seed=0):
+    """Runs every (civ1_params, civ2_params) entry of param_grid in a pool of n_workers processes.
+
+    Entry i gets the i-th child of np.random.SeedSequence(seed), so streams
+    are independent of each other and results do not depend on n_workers.
+    Workers are started with "spawn": a forked pool hangs at interpreter exit
+    once the parallel Numba kernel has run in this process. Returns one
+    _run_one result tuple per entry, in order.
+    """
+    param_grid = list(param_grid)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(param_grid))
+    tasks = [(civ1_params, civ2_params, num_turns, child_seed)
+             for (civ1_params, civ2_params), child_seed in zip(param_grid, child_seeds)]
+    with get_context("spawn").Pool(n_workers) as pool:
+        return pool.starmap(_run_one, tasks)
+
+# --- Batched Simulation (Structure of Arrays) ---
+# A batch of civilizations is a (2, N) array of CIV_DTYPE records: row 0 holds
+# the first civilization of each of the N independent pairs, row 1 the second.
+# Columns of a structured array are strided, so run_batch copies each field
+# into its own contiguous array and every turn phase runs as a handful of
+# array expressions over all pairs.
+
+# Single precision halves memory traffic and doubles SIMD lanes; bench.py
+# measures the drift against float64.
+STATE_DTYPE = np.float32
+
+def civ_dtype(float_dtype=STATE_DTYPE):
+    """Structured record dtype of one batched civilization, with float fields of float_dtype."""
+    return np.dtype([
+        ("pop", float_dtype), ("res", float_dtype), ("tech", float_dtype),
+        ("intel", float_dtype), ("trate", float_dtype), ("agg", float_dtype), ("coop", float_dtype),
+        ("alive", np.bool_),
+    ])
+
+CIV_DTYPE = civ_dtype()
+
+# Civilization attribute backing each CIV_DTYPE field
+_CIV_FIELDS = {
+    "pop": "population", "res": "resources", "tech": "tech_level",
+    "intel": "intelligence", "trate": "tech_rate", "agg": "aggressiveness", "coop": "cooperation",
+    "alive": "is_alive",
+}
+
+def batch_civs(civ1, civ2, n_pairs, float_dtype=STATE_DTYPE):
+    """Builds a (2, N) batch holding n_pairs copies of the civ1 vs civ2 matchup (CIV_DTYPE by default)."""
+    civs = np.zeros((2, n_pairs), dtype=civ_dtype(float_dtype))
+    for row, civ in enumerate((civ1, civ2)):
+        for name, attr in _CIV_FIELDS.items():
+            civs[name][row] = getattr(civ, attr)
+    return civs
+
+def internal_phase(pop, res, tech, intel, trate, coop):
+    """Vectorized internal phase: gather, consume, grow and research in one pass over the state arrays.
+
+    Returns the updated (population, resources, tech_level) arrays and the
+    mask of civs that starved (their state is not zeroed here).
+    """
+    # Gather then consume; the first op copies, the rest update the copies in place
+    res = res + pop * RESOURCE_GATHER_BASE * (1 + tech / 10.0)
+    res -= pop * POP_RESOURCE_COST
+    pop = pop - np.minimum(pop, np.maximum(-res, 0) / POP_RESOURCE_COST * 1.5) # Lose pop faster than normal consumption
+    np.maximum(res, 0, out=res)
+    starved = pop <= 0
+
+    # Growth (only with resources left) and research (only above the research cost)
+    resource_factor = np.maximum(0, 1 + res / (pop * POP_RESOURCE_COST * 5 + 1))
+    pop += np.where(res > 0, pop * POP_GROWTH_RATE_BASE * resource_factor * (1 + coop / 20.0), 0)
+    tech_points_potential = intel * trate * TECH_IMPROVEMENT_BASE * (pop / 1000.0) / (1 + tech * 0.1)
+    resources_to_spend = np.where(res >= TECH_RESOURCE_COST, np.minimum(res, tech_points_potential * TECH_RESOURCE_COST), 0)
+    res -= resources_to_spend
+    tech = tech + resources_to_spend / TECH_RESOURCE_COST
+    return pop, res, tech, starved
+
+# STRENGTH_DIFF_AGG_MOD as a log-strength difference, for interact
+_LOG_STRENGTH_DIFF_AGG_MOD = math.log(STRENGTH_DIFF_AGG_MOD)
+
+def interact(pop, res, tech, intel, agg, coop, running, u):
+    """Vectorized interaction phase for every running pair, using this turn's uniform draws u (N, 6).
+
+    Both checks are decided for all pairs at once; the combat and
+    cooperation math then only runs on the index subsets of pairs that
+    fight or cooperate. Returns the updated (population, resources,
+    tech_level) arrays and the mask of civs eliminated in combat.
+    """
+    # Compare strengths in log space, where the ratio test is a difference; only fighting pairs need the strengths themselves
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_strength = np.log(pop) + TECH_COMBAT_FACTOR * np.log(tech)
+        ls1, ls2 = log_strength
+        log_ratio = np.abs(ls1 - ls2)
+    agg1, agg2 = agg
+    combined_agg = agg1 + agg2
+    combined_coop = coop[0] + coop[1]
+
+    # Determine relative strength (pairs that already ended have zero strength, i.e. -inf in log space)
+    first_stronger = (ls1 > ls2) & (ls2 > -np.inf)
+    second_stronger = (ls2 > ls1) & (ls1 > -np.inf)
+    stronger_agg = np.where(first_stronger, agg1, agg2)
+    weaker_agg = np.where(first_stronger, agg2, agg1)
+
+    # Decide both checks for every pair up front; cooperation only if no conflict occurred
+    opportunistic = ((first_stronger | second_stronger) & (stronger_agg > weaker_agg + 3)
+                     & (log_ratio > _LOG_STRENGTH_DIFF_AGG_MOD) & (u[:, 1] < stronger_agg / 10.0))
+    will_fight = running & ((combined_agg > CONFLICT_THRESHOLD_AGG * (0.8 + 0.4 * u[:, 0])) | opportunistic)
+    will_coop = running & ~will_fight & (combined_coop > COOPERATION_THRESHOLD_COOP * (0.8 + 0.4 * u[:, 5]))
+    fight = np.flatnonzero(will_fight)
+    coop_idx = np.flatnonzero(will_coop)
+
+    pop, res, tech = pop.copy(), res.copy(), tech.copy()
+    killed = np.zeros(pop.shape, dtype=bool)
+
+    # 1. Conflict, for the fighting pairs only
+    if fight.size:
+        uf = u[fight]
+        # Exact strengths for the combat math (exp of the log would lose precision in float32)
+        fs1, fs2 = pop[:, fight] * (tech[:, fight] ** TECH_COMBAT_FACTOR)
+        # Attacker is the more aggressive civ; ties are broken by a coin flip
+        atk_is_1 = (agg1[fight] > agg2[fight]) | ((agg1[fight] == agg2[fight]) & (uf[:, 2] < 0.5))
+        s_attacker = np.where(atk_is_1, fs1, fs2)
+        s_defender = np.where(atk_is_1, fs2, fs1)
+
+        defender_effective_strength = s_defender / (1 + np.maximum(0, s_attacker / (s_defender + 1) - 1))
+        attacker_loss_mult = COMBAT_LOSS_BASE * (1 + defender_effective_strength / (s_attacker + 1)) * (0.7 + 0.6 * uf[:, 3])
+        defender_loss_mult = COMBAT_LOSS_BASE * (1 + s_attacker / (defender_effective_strength + 1)) * (0.7 + 0.6 * uf[:, 4])
+        is_attacker = np.stack([atk_is_1, ~atk_is_1])
+        loss_mult = np.where(is_attacker, attacker_loss_mult, defender_loss_mult)
+
+        fpop, fres = pop[:, fight], res[:, fight]
+        tech_factor = 1 + tech[:, fight] * 0.1
+        fpop = fpop - np.minimum(fpop * 0.9, fpop * loss_mult / tech_factor)
+        fres = fres - np.minimum(fres * 0.9, fres * loss_mult * tech_factor)
+        pop[:, fight], res[:, fight] = fpop, fres
+        killed[:, fight] = (fpop <= 1) | (fres < 0)
+
+    # 2. Cooperation, for the cooperating pairs only
+    if coop_idx.size:
+        res[:, coop_idx] += res[:, coop_idx] * COOP_RESOURCE_BONUS * (coop[::-1, coop_idx] / 10.0)
+        tech[:, coop_idx] += COOP_TECH_BONUS * (intel[::-1, coop_idx] / 5.0)
+
+    return pop, res, tech, killed
+
+def run_batch(civs, num_turns, seed=None, verbose=None, record_history=False):
+    """Runs N independent two-civ simulations side by side.
+
+    civs is a (2, N) CIV_DTYPE batch (see batch_civs); the whole run uses
+    the precision of its float fields. Each pair stops
+    evolving once either of its civilizations is eliminated. Returns a new
+    batch holding the final state; with record_history a history array
+    shaped (num_turns + 1, N, 2, 3) holding (pop, res, tech) after every turn
+    is returned as well. verbose defaults to VERBOSE.
+    """
+    if verbose is None:
+        verbose = VERBOSE
+    rng = np.random.default_rng(seed)
+    intel = np.maximum(1, civs["intel"])
+    trate = np.maximum(0.1, civs["trate"])
+    agg = np.maximum(0, civs["agg"])
+    coop = np.maximum(0, civs["coop"])
+    n_pairs = civs.shape[1]
+
+    pop = civs["pop"].copy()
+    res = civs["res"].copy()
+    tech = civs["tech"].copy()
+    alive = civs["alive"].copy()
+    float_dtype = civs["pop"].dtype
+    history = np.empty((num_turns + 1, n_pairs, 2, 3), dtype=float_dtype) if record_history else None
+    if record_history:
+        history[0] = np.stack([pop, res, tech], axis=-1).transpose(1, 0, 2)
+
+    # Every uniform draw of the run in one call: (turn, pair, decision)
+    # (drawn in float64 and cast, so a seed gives the same stream at either precision)
+    draws = rng.random((num_turns, n_pairs, 6)).astype(float_dtype, copy=False)
+
+    # Long runs overflow to inf/nan by design (as in the scalar path), so don't warn about it every turn
+    with np.errstate(over="ignore", invalid="ignore"):
+        for turn in range(1, num_turns + 1):
+            running = alive.all(axis=0)
+            if not running.any():
+                if record_history:
+                    history[turn:] = history[turn - 1]
+                break
+
+            # --- Internal Phase (vectorized over all running pairs) ---
+            new_pop, new_res, new_tech, starved = internal_phase(pop, res, tech, intel, trate, coop)
+            new_pop, new_res, new_tech = (np.where(starved, 0, x) for x in (new_pop, new_res, new_tech))
+
+            pop = np.where(running, new_pop, pop)
+            res = np.where(running, new_res, res)
+            tech = np.where(running, new_tech, tech)
+            alive &= ~(starved & running)
+
+            # --- Interaction Phase ---
+            pop, res, tech, killed = interact(pop, res, tech, intel, agg, coop, alive.all(axis=0), draws[turn - 1])
+            pop, res, tech = (np.where(killed, 0, x) for x in (pop, res, tech))
+            alive &= ~killed
+
+            if record_history:
+                history[turn] = np.stack([pop, res, tech], axis=-1).transpose(1, 0, 2)
+            if verbose:
+                print(f"Turn {turn}: {alive.all(axis=0).sum()} of {n_pairs} pairs still running")
+
+    final = civs.copy()
+    final["pop"], final["res"], final["tech"], final["alive"] = pop, res, tech, alive
+    if record_history:
+        return final, history
+    return final
+
+# --- JIT Kernel (Numba) ---
+# The same turn logic written against plain scalars and arrays so Numba can
+# compile it. Replicas are independent, so simulate_batch spreads them across
+# cores with prange; each replica reseeds the RNG so results are reproducible.
+
+# Inlined into each caller at the IR level, so it is compiled under the caller's flags instead of
+# sharing one compiled body: if the fastmath batch kernels compile it first, simulate_isolated
+# would otherwise run fastmath code too and stop matching run_simulation
+@njit(cache=True, error_model="numpy", inline="always")
+def _internal_step(pop, res, tech, intel, trate, coop):
+    """One civ's internal phase on plain floats. Returns the new (pop, res, tech); pop <= 0 means it starved."""
+    res += pop * RESOURCE_GATHER_BASE * (1 + tech / 10.0)
+    res -= pop * POP_RESOURCE_COST
+    if res < 0:
+        pop -= min(pop, -res / POP_RESOURCE_COST * 1.5)
+        res = 0.0
+        if pop <= 0:
+            return pop, res, tech
+    if res > 0:
+        resource_factor = max(0.0, 1 + (res / (pop * POP_RESOURCE_COST * 5 + 1)))
+        pop += pop * POP_GROWTH_RATE_BASE * resource_factor * (1 + coop / 20.0)
+    if res >= TECH_RESOURCE_COST:
+        tech_points_potential = intel * trate * TECH_IMPROVEMENT_BASE * (pop / 1000.0) / (1 + tech * 0.1)
+        resources_to_spend = min(res, tech_points_potential * TECH_RESOURCE_COST)
+        res -= resources_to_spend
+        tech += resources_to_spend / TECH_RESOURCE_COST
+    return pop, res, tech
+
+@njit(cache=True, error_model="numpy")
+def _simulate_isolated(pop, res, tech, intel, trate, coop, n_turns):
+    """Runs up to n_turns internal phases, stopping before a turn that would starve the civ.
+
+    Returns the new (pop, res, tech) and the number of turns advanced.
+    """
+    for t in range(n_turns):
+        new_pop, new_res, new_tech = _internal_step(pop, res, tech, intel, trate, coop)
+        if new_pop <= 0:
+            return pop, res, tech, t
+        pop, res, tech = new_pop, new_res, new_tech
+    return pop, res, tech, n_turns
+
+def _isolated_args(civ):
+    return (float(civ.population), float(civ.resources), float(civ.tech_level),
+            float(civ.intelligence), float(civ.tech_rate), float(civ.cooperation))
+
+def simulate_isolated(civ, n_turns):
+    """Advances a living civ by up to n_turns internal phases in one compiled call, with no interaction.
+
+    Stops before a turn on which the civ would starve, so the caller can run
+    that turn the normal way. Returns the number of turns advanced.
+    """
+    civ.population, civ.resources, civ.tech_level, turns = _simulate_isolated(*_isolated_args(civ), n_turns)
+    return turns
+
+@njit(cache=True, fastmath=True, error_model="numpy")
+def _turn(pop, res, tech, intel, trate, agg, coop, alive):
+    """Advances one replica (length-2 state arrays) by a turn. Returns False once a civ is eliminated."""
+    # --- Internal Phase ---
+    for c in range(2):
+        pop[c], res[c], tech[c] = _internal_step(pop[c], res[c], tech[c], intel[c], trate[c], coop[c])
+        if pop[c] <= 0:
+            alive[c] = False
+            pop[c] = res[c] = tech[c] = 0.0
+    if not (alive[0] and alive[1]):
+        return False
+
+    # --- Interaction Phase ---
+    strength1 = pop[0] * math.pow(tech[0], TECH_COMBAT_FACTOR)
+    strength2 = pop[1] * math.pow(tech[1], TECH_COMBAT_FACTOR)
+    combined_agg = agg[0] + agg[1]
+    combined_coop = coop[0] + coop[1]
+
+    stronger = -1
+    strength_ratio = 1.0
+    if strength1 > strength2 and strength2 > 0:
+        strength_ratio = strength1 / strength2
+        stronger = 0
+    elif strength2 > strength1 and strength1 > 0:
+        strength_ratio = strength2 / strength1
+        stronger = 1
+
+    will_fight = False
+    if combined_agg > CONFLICT_THRESHOLD_AGG * np.random.uniform(0.8, 1.2):
+        will_fight = True
+    elif stronger >= 0 and agg[stronger] > agg[1 - stronger] + 3 and strength_ratio > STRENGTH_DIFF_AGG_MOD:
+        if np.random.random() < agg[stronger] / 10.0:
+            will_fight = True
+
+    if will_fight:
+        if agg[0] > agg[1] or (agg[0] == agg[1] and np.random.random() < 0.5):
+            a, s_attacker, s_defender = 0, strength1, strength2
+        else:
+            a, s_attacker, s_defender = 1, strength2, strength1
+        d = 1 - a
+
+        defender_effective_strength = s_defender / (1 + max(0.0, (s_attacker / (s_defender + 1) - 1)))
+        attacker_loss_mult = COMBAT_LOSS_BASE * (1 + defender_effective_strength / (s_attacker + 1)) * np.random.uniform(0.7, 1.3)
+        defender_loss_mult = COMBAT_LOSS_BASE * (1 + s_attacker / (defender_effective_strength + 1)) * np.random.uniform(0.7, 1.3)
+
+        attacker_tech_factor = 1 + tech[a] * 0.1
+        defender_tech_factor = 1 + tech[d] * 0.1
+        attacker_pop_loss = min(pop[a] * 0.9, pop[a] * attacker_loss_mult * (1 / attacker_tech_factor))
+        attacker_res_loss = min(res[a] * 0.9, res[a] * attacker_loss_mult * attacker_tech_factor)
+        defender_pop_loss = min(pop[d] * 0.9, pop[d] * defender_loss_mult * (1 / defender_tech_factor))
+        defender_res_loss = min(res[d] * 0.9, res[d] * defender_loss_mult * defender_tech_factor)
+
+        pop[a] -= attacker_pop_loss
+        res[a] -= attacker_res_loss
+        pop[d] -= defender_pop_loss
+        res[d] -= defender_res_loss
+
+        for c in range(2):
+            if pop[c] <= 1 or res[c] < 0:
+                alive[c] = False
+                pop[c] = res[c] = tech[c] = 0.0
+
+    elif combined_coop > COOPERATION_THRESHOLD_COOP * np.random.uniform(0.8, 1.2):
+        res_bonus1 = res[0] * COOP_RESOURCE_BONUS * (coop[1] / 10.0)
+        res_bonus2 = res[1] * COOP_RESOURCE_BONUS * (coop[0] / 10.0)
+        res[0] += res_bonus1
+        res[1] += res_bonus2
+        tech[0] += COOP_TECH_BONUS * (intel[1] / 5.0)
+        tech[1] += COOP_TECH_BONUS * (intel[0] / 5.0)
+
+    return alive[0] and alive[1]
+
+@njit(cache=True, parallel=True, fastmath=True, error_model="numpy")
+def _simulate_batch(params, n_turns, seeds, pop, res, tech, alive, history):
+    """Compiled replica loop; updates the (R, 2) state arrays in place.
+
+    history is either empty or shaped (n_turns + 1, R, 2, 3) to be filled.
+    """
+    record = history.shape[0] > 0
+    for r in prange(params.shape[0]):
+        np.random.seed(seeds[r])
+        intel = np.maximum(1.0, params[r, :, 0])
+        trate = np.maximum(0.1, params[r, :, 1])
+        agg = np.maximum(0.0, params[r, :, 2])
+        coop = np.maximum(0.0, params[r, :, 3])
+        running = True
+        for t in range(n_turns + 1):
+            if running and t > 0:
+                running = _turn(pop[r], res[r], tech[r], intel, trate, agg, coop, alive[r])
+            elif not running and not record:
+                break
+            if record:
+                for c in range(2):
+                    history[t, r, c, 0] = pop[r, c]
+                    history[t, r, c, 1] = res[r, c]
+                    history[t, r, c, 2] = tech[r, c]
+
+def batch_params(civ1, civ2, n_replicas):
+    """Builds an (R, 2, 4) array of (intelligence, tech_rate, aggressiveness, cooperation) for simulate_batch."""
+    civs = batch_civs(civ1, civ2, n_replicas, np.float64)
+    return np.ascontiguousarray(np.stack([civs[name] for name in ("intel", "trate", "agg", "coop")], axis=-1).transpose(1, 0, 2))
+
+def simulate_batch(params, n_turns, seed=0, record_history=False):
+    """Runs R independent replicas with the compiled kernel.
+
+    params is an (R, 2, 4) array (see batch_params); replica r is seeded with
+    seed + r. Returns the final (population, resources, tech_level, alive)
+    arrays, each shaped (R, 2), plus an (n_turns + 1, R, 2, 3) history array
+    when record_history is set (same layout as run_batch).
+    """
+    params = np.asarray(params, dtype=np.float64)
+    n_replicas = params.shape[0]
+    pop = np.full((n_replicas, 2), INITIAL_POPULATION, dtype=np.float64)
+    res = np.full((n_replicas, 2), INITIAL_RESOURCES, dtype=np.float64)
+    tech = np.full((n_replicas, 2), INITIAL_TECH_LEVEL, dtype=np.float64)
+    alive = np.ones((n_replicas, 2), dtype=np.bool_)
+    history = np.empty((n_turns + 1 if record_history else 0, n_replicas, 2, 3), dtype=np.float64)
+    seeds = seed + np.arange(n_replicas)
+    _simulate_batch(params, n_turns, seeds, pop, res, tech, alive, history)
+    if record_history:
+        return pop, res, tech, alive, history
+    return pop, res, tech, alive
+
 # --- Setup and Run ---
 if __name__ == "__main__":
     # Example Civilizations (Adjust these values!)
@@ -299,6 +881,7 @@ if __name__ == "__main__":
     #     # Keep the default civs defined above if input fails
 
 
+    VERBOSE = True # Narrate every turn for this interactive run
     simulation_turns = 100
     run_simulation(civilization1, civilization2, simulation_turns)
 
@@ -0,0 +1,200 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Compiled turn kernel for the two-civ model.
+
+Build in place with:  cythonize -i sim_kernel.pyx
+
+step() runs without the GIL, so several simulations can be advanced from
+threads instead of processes. Random numbers are passed in precomputed,
+six per turn in the same order run_simulation uses them, so run_c matches
+run_simulation for the same draws (check.py verifies this).
+"""
+from libc.math cimport pow
+
+import sim as _sim
+
+# Simulation constants, read once from sim.py so the two stay in sync
+cdef double INITIAL_POPULATION = _sim.INITIAL_POPULATION
+cdef double INITIAL_RESOURCES = _sim.INITIAL_RESOURCES
+cdef double INITIAL_TECH_LEVEL = _sim.INITIAL_TECH_LEVEL
+cdef double POP_GROWTH_RATE_BASE = _sim.POP_GROWTH_RATE_BASE
+cdef double RESOURCE_GATHER_BASE = _sim.RESOURCE_GATHER_BASE
+cdef double TECH_IMPROVEMENT_BASE = _sim.TECH_IMPROVEMENT_BASE
+cdef double CONFLICT_THRESHOLD_AGG = _sim.CONFLICT_THRESHOLD_AGG
+cdef double COOPERATION_THRESHOLD_COOP = _sim.COOPERATION_THRESHOLD_COOP
+cdef double STRENGTH_DIFF_AGG_MOD = _sim.STRENGTH_DIFF_AGG_MOD
+cdef double POP_RESOURCE_COST = _sim.POP_RESOURCE_COST
+cdef double TECH_RESOURCE_COST = _sim.TECH_RESOURCE_COST
+cdef double COMBAT_LOSS_BASE = _sim.COMBAT_LOSS_BASE
+cdef double TECH_COMBAT_FACTOR = _sim.TECH_COMBAT_FACTOR
+cdef double COOP_RESOURCE_BONUS = _sim.COOP_RESOURCE_BONUS
+cdef double COOP_TECH_BONUS = _sim.COOP_TECH_BONUS
+
+
+ctypedef struct civ_t:
+    double pop, res, tech, intel, trate, agg, coop
+    bint alive
+
+
+cdef class CivState:
+    """State of one civilization as plain C doubles (mirrors sim.Civilization without the name)."""
+    cdef civ_t s
+
+    def __init__(self, double intelligence, double tech_rate, double aggressiveness, double cooperation):
+        self.s.intel = max(1.0, intelligence)
+        self.s.trate = max(0.1, tech_rate)
+        self.s.agg = max(0.0, aggressiveness)
+        self.s.coop = max(0.0, cooperation)
+        self.s.pop = INITIAL_POPULATION
+        self.s.res = INITIAL_RESOURCES
+        self.s.tech = INITIAL_TECH_LEVEL
+        self.s.alive = True
+
+    @staticmethod
+    def from_civ(civ):
+        """Copies the traits and current state of a sim.Civilization."""
+        cdef CivState state = CivState(civ.intelligence, civ.tech_rate, civ.aggressiveness, civ.cooperation)
+        state.s.pop, state.s.res, state.s.tech, state.s.alive = civ.population, civ.resources, civ.tech_level, civ.is_alive
+        return state
+
+    @property
+    def population(self):
+        return self.s.pop
+
+    @property
+    def resources(self):
+        return self.s.res
+
+    @property
+    def tech_level(self):
+        return self.s.tech
+
+    @property
+    def is_alive(self):
+        return self.s.alive
+
+
+cdef inline void _die(civ_t* c) noexcept nogil:
+    c.alive = False
+    c.pop = 0
+    c.res = 0
+    c.tech = 0
+
+
+cdef inline void _internal(civ_t* c) noexcept nogil:
+    cdef double resource_factor, tech_points_potential, resources_to_spend
+    if not c.alive:
+        return
+    c.res += c.pop * RESOURCE_GATHER_BASE * (1 + c.tech / 10.0)
+    c.res -= c.pop * POP_RESOURCE_COST
+    if c.res < 0:
+        c.pop -= min(c.pop, -c.res / POP_RESOURCE_COST * 1.5)
+        c.res = 0
+        if c.pop <= 0:
+            _die(c)
+            return
+    if c.res > 0:
+        resource_factor = max(0.0, 1 + (c.res / (c.pop * POP_RESOURCE_COST * 5 + 1)))
+        c.pop += c.pop * POP_GROWTH_RATE_BASE * resource_factor * (1 + c.coop / 20.0)
+    if c.res >= TECH_RESOURCE_COST:
+        tech_points_potential = c.intel * c.trate * TECH_IMPROVEMENT_BASE * (c.pop / 1000.0) / (1 + c.tech * 0.1)
+        resources_to_spend = min(c.res, tech_points_potential * TECH_RESOURCE_COST)
+        c.res -= resources_to_spend
+        c.tech += resources_to_spend / TECH_RESOURCE_COST
+
+
+cdef inline void _apply_losses(civ_t* c, double loss_mult) noexcept nogil:
+    cdef double tech_factor = 1 + c.tech * 0.1
+    cdef double pop_loss = min(c.pop * 0.9, c.pop * loss_mult * (1 / tech_factor))
+    cdef double res_loss = min(c.res * 0.9, c.res * loss_mult * tech_factor)
+    c.pop -= pop_loss
+    c.res -= res_loss
+
+
+cdef bint _step(civ_t* a, civ_t* b, double[:] rnd) noexcept nogil:
+    cdef double strength_a, strength_b, strength_ratio = 1.0
+    cdef double s_attacker, s_defender, defender_effective_strength
+    cdef double attacker_loss_mult, defender_loss_mult
+    cdef double res_bonus_a, res_bonus_b
+    cdef civ_t* stronger = NULL
+    cdef civ_t* weaker = NULL
+    cdef civ_t* attacker
+    cdef civ_t* defender
+    cdef bint will_fight = False
+
+    # --- Internal Phase ---
+    _internal(a)
+    _internal(b)
+    if not (a.alive and b.alive):
+        return False
+
+    # --- Interaction Phase ---
+    strength_a = a.pop * pow(a.tech, TECH_COMBAT_FACTOR)
+    strength_b = b.pop * pow(b.tech, TECH_COMBAT_FACTOR)
+    if strength_a > strength_b and strength_b > 0:
+        strength_ratio = strength_a / strength_b
+        stronger, weaker = a, b
+    elif strength_b > strength_a and strength_a > 0:
+        strength_ratio = strength_b / strength_a
+        stronger, weaker = b, a
+
+    if a.agg + b.agg > CONFLICT_THRESHOLD_AGG * (0.8 + 0.4 * rnd[0]):
+        will_fight = True
+    elif stronger != NULL and stronger.agg > weaker.agg + 3 and strength_ratio > STRENGTH_DIFF_AGG_MOD:
+        will_fight = rnd[1] < stronger.agg / 10.0
+
+    if will_fight:
+        if a.agg > b.agg or (a.agg == b.agg and rnd[2] < 0.5):
+            attacker, defender, s_attacker, s_defender = a, b, strength_a, strength_b
+        else:
+            attacker, defender, s_attacker, s_defender = b, a, strength_b, strength_a
+
+        defender_effective_strength = s_defender / (1 + max(0.0, (s_attacker / (s_defender + 1) - 1)))
+        attacker_loss_mult = COMBAT_LOSS_BASE * (1 + defender_effective_strength / (s_attacker + 1)) * (0.7 + 0.6 * rnd[3])
+        defender_loss_mult = COMBAT_LOSS_BASE * (1 + s_attacker / (defender_effective_strength + 1)) * (0.7 + 0.6 * rnd[4])
+        _apply_losses(attacker, attacker_loss_mult)
+        _apply_losses(defender, defender_loss_mult)
+
+        if attacker.pop <= 1 or attacker.res < 0:
+            _die(attacker)
+        if defender.pop <= 1 or defender.res < 0:
+            _die(defender)
+
+    elif a.coop + b.coop > COOPERATION_THRESHOLD_COOP * (0.8 + 0.4 * rnd[5]):
+        res_bonus_a = a.res * COOP_RESOURCE_BONUS * (b.coop / 10.0)
+        res_bonus_b = b.res * COOP_RESOURCE_BONUS * (a.coop / 10.0)
+        a.res += res_bonus_a
+        b.res += res_bonus_b
+        a.tech += COOP_TECH_BONUS * (b.intel / 5.0)
+        b.tech += COOP_TECH_BONUS * (a.intel / 5.0)
+
+    return a.alive and b.alive
+
+
+def step(CivState a not None, CivState b not None, double[:] rnd not None):
+    """Advances the pair by one turn using the six draws in rnd. Returns False once a civ is eliminated."""
+    cdef bint running
+    if rnd.shape[0] < 6:
+        raise ValueError("rnd must hold at least six draws")
+    with nogil:
+        running = _step(&a.s, &b.s, rnd)
+    return running
+
+
+def run_c(states, int n_turns, double[:, :, :] rnd not None):
+    """Runs each (CivState, CivState) pair in states for up to n_turns turns, in place.
+
+    rnd is shaped (len(states), n_turns, 6); pair r consumes rnd[r]. The turn
+    loop of each pair runs with the GIL released.
+    """
+    cdef CivState a, b
+    cdef Py_ssize_t r
+    cdef int t
+    if rnd.shape[0] < len(states) or rnd.shape[1] < n_turns or rnd.shape[2] < 6:
+        raise ValueError("rnd must be shaped (len(states), n_turns, 6)")
+    for r, (a, b) in enumerate(states):
+        if a is None or b is None:
+            raise TypeError(f"states[{r}] must be a pair of CivState objects, not None")
+        with nogil:
+            for t in range(n_turns):
+                if not _step(&a.s, &b.s, rnd[r, t]):
+                    break